@@ -1,8 +1,114 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import yt_dlp
+import requests
+from requests.adapters import HTTPAdapter
 import os
 from pathlib import Path
 import zipfile
+import itertools
+import json
+import queue
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+_VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/|shorts/|embed/|live/)([\w-]{11})")
+_PLAYLIST_ID_RE = re.compile(r"[?&]list=([\w-]+)")
+META_TTL = 24 * 3600
+SOCKET_TIMEOUT = 10
+
+# A progressive MP4 at exactly the requested height needs no FFmpeg merge;
+# otherwise fall back to separate streams
+_FORMAT_BY_QUALITY = {
+    "best": "bestvideo+bestaudio/best",
+    **{
+        f"{height}p": f"best[ext=mp4][height={height}]"
+        f"/bestvideo[height<={height}]+bestaudio/best"
+        for height in (1080, 720, 480, 360)
+    },
+}
+
+# Prefer sources already in the target codec; FFmpegExtractAudio then just
+# remuxes the stream instead of re-encoding it.
+_AUDIO_SOURCE_BY_FORMAT = {
+    "mp3": "bestaudio[acodec=mp3]/bestaudio/best",
+    "m4a": "bestaudio[ext=m4a]/bestaudio/best",
+    "opus": "bestaudio[acodec=opus]/bestaudio/best",
+}
+
+
+def _walk_files(root):
+    """Yield a DirEntry for every file below root.
+
+    DirEntry answers is_dir/is_file from the directory listing itself, which
+    saves a stat() call per path compared to Path.rglob.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
+def _deflate_file(path, tmp_dir):
+    """Compress a file to a raw DEFLATE stream in a temporary file.
+
+    Returns (tmp_path, crc, file_size, compress_size) for the zip headers.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    crc = size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+        while chunk := src.read(1 << 20):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            dst.write(compressor.compress(chunk))
+        dst.write(compressor.flush())
+        compress_size = dst.tell()
+    return tmp_path, crc, size, compress_size
+
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
 
 
 class YouTubeDownloader:
@@ -10,13 +116,62 @@ class YouTubeDownloader:
         """Initialize downloader with a download directory."""
         self.download_path = Path(download_path)
         self.download_path.mkdir(exist_ok=True)
+        # Preview metadata keyed by URL, backed by an on-disk store
+        self._info_cache = _TTLCache(maxsize=3000, ttl=3600)
+        # Full yt-dlp info from previews; format URLs expire after a few hours
+        self._raw_info_cache = _TTLCache(maxsize=32, ttl=1800)
+        # Pool of long-lived instances for metadata lookups, so extractor
+        # setup and the HTTP connection pool are reused across reruns without
+        # sessions waiting on each other
+        self._ydl_pool = queue.LifoQueue()
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.download_path / ".meta.sqlite", check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta"
+            " (id TEXT PRIMARY KEY, fetched_at INTEGER, payload BLOB)"
+        )
+        self._db.commit()
+
+    def __del__(self):
+        pool = getattr(self, "_ydl_pool", None)
+        while pool is not None and not pool.empty():
+            pool.get_nowait().close()
+
+    def _extract_info(self, url, **params):
+        """Extract metadata with a pooled instance and temporary params."""
+        try:
+            ydl = self._ydl_pool.get_nowait()
+        except queue.Empty:
+            ydl = yt_dlp.YoutubeDL({"quiet": True, "socket_timeout": SOCKET_TIMEOUT})
+        saved = {k: ydl.params.get(k) for k in params}
+        ydl.params.update(params)
+        try:
+            return ydl.extract_info(url, download=False)
+        finally:
+            ydl.params.update(saved)
+            self._ydl_pool.put(ydl)
+
+    def _extract_for_download(self, ydl, url):
+        """Download url, reusing info from a recent preview when available."""
+        raw = self._raw_info_cache.get(self._meta_key("video", url))
+        if raw is not None:
+            try:
+                return ydl.process_ie_result(
+                    ydl.sanitize_info(raw, remove_private_keys=True), download=True
+                )
+            except yt_dlp.utils.DownloadError:
+                pass  # Stale format URLs; extract afresh
+        return ydl.extract_info(url, download=True)
 
     def progress_hook(self, d, progress_bar=None, status_text=None):
         """Hook for download progress."""
         if d["status"] == "downloading":
-            if progress_bar and "downloaded_bytes" in d and "total_bytes" in d:
-                percent = d["downloaded_bytes"] / d["total_bytes"]
-                progress_bar.progress(percent)
+            total = d.get("total_bytes") or d.get("total_bytes_estimate")
+            if progress_bar and total and "downloaded_bytes" in d:
+                progress_bar.progress(min(d["downloaded_bytes"] / total, 1.0))
             if status_text:
                 status_text.text(
                     f"Downloading: {d.get('_percent_str', 'N/A')} at {d.get('_speed_str', 'N/A')}"
@@ -25,14 +180,74 @@ class YouTubeDownloader:
             if status_text:
                 status_text.text("Download complete, processing...")
 
-    def download_video(self, url, quality="best"):
+    def _download_opts(
+        self,
+        concurrent_fragments=8,
+        use_aria2c=False,
+        progress_bar=None,
+        status_text=None,
+    ):
+        """Transfer options shared by every download."""
+        opts = {
+            # Fetch DASH/HLS fragments in parallel
+            "concurrent_fragment_downloads": concurrent_fragments,
+            # Pull non-fragmented formats in 10 MiB range requests
+            "http_chunk_size": 10485760,
+            "socket_timeout": SOCKET_TIMEOUT,
+        }
+        if use_aria2c and shutil.which("aria2c"):
+            # Split each file across 16 connections to get past per-connection
+            # throttling
+            opts["external_downloader"] = "aria2c"
+            opts["external_downloader_args"] = {
+                "aria2c": [
+                    "-x",
+                    "16",
+                    "-s",
+                    "16",
+                    "-k",
+                    "1M",
+                    "--summary-interval=0",
+                    "--console-log-level=warn",
+                ]
+            }
+        if progress_bar or status_text:
+            last_ui_ts = 0.0
+            ui_lock = threading.Lock()
+            ctx = get_script_run_ctx()
+
+            def hook(d):
+                # Limit each download to 10 UI updates a second
+                nonlocal last_ui_ts
+                if d["status"] == "downloading":
+                    now = time.monotonic()
+                    with ui_lock:
+                        if now - last_ui_ts < 0.1:
+                            return
+                        last_ui_ts = now
+                # Fragmented formats report progress from yt-dlp's worker
+                # threads, which need the script's context to update widgets
+                add_script_run_ctx(threading.current_thread(), ctx)
+                self.progress_hook(d, progress_bar, status_text)
+
+            opts["progress_hooks"] = [hook]
+        return opts
+
+    def download_video(
+        self,
+        url,
+        quality="best",
+        concurrent_fragments=8,
+        use_aria2c=False,
+        progress_bar=None,
+        status_text=None,
+    ):
         """Download video with audio."""
         ydl_opts = {
-            "format": (
-                "bestvideo+bestaudio/best"
-                if quality == "best"
-                else f"bestvideo[height<={quality[:-1]}]+bestaudio/best"
+            **self._download_opts(
+                concurrent_fragments, use_aria2c, progress_bar, status_text
             ),
+            "format": _FORMAT_BY_QUALITY[quality],
             "outtmpl": str(self.download_path / "%(title)s.%(ext)s"),
             "merge_output_format": "mp4",
         }
@@ -40,16 +255,27 @@ class YouTubeDownloader:
         try:
             print(f"Downloading Video: {self.download_path}")
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
+                info = self._extract_for_download(ydl, url)
                 filename = ydl.prepare_filename(info)
                 return True, info["title"], filename
         except Exception as e:
             return False, str(e), None
 
-    def download_audio(self, url, format="mp3"):
+    def download_audio(
+        self,
+        url,
+        format="mp3",
+        concurrent_fragments=8,
+        use_aria2c=False,
+        progress_bar=None,
+        status_text=None,
+    ):
         """Download only audio from video."""
         ydl_opts = {
-            "format": "bestaudio/best",
+            **self._download_opts(
+                concurrent_fragments, use_aria2c, progress_bar, status_text
+            ),
+            "format": _AUDIO_SOURCE_BY_FORMAT.get(format, "bestaudio/best"),
             "outtmpl": str(self.download_path / "%(title)s.%(ext)s"),
             "ffmpeg_location": r"C:\ffmpeg\bin",  # <-- adjust if needed
             "postprocessors": [
@@ -64,122 +290,301 @@ class YouTubeDownloader:
         try:
             # print(f"Downloading Audio: {self.download_path}")
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
+                info = self._extract_for_download(ydl, url)
                 filename = str(self.download_path / f"{info['title']}.{format}")
                 return True, info["title"], filename
         except Exception as e:
             return False, str(e), None
 
     def download_playlist(
-        self, url, download_type="video", quality="best", audio_format="mp3"
+        self,
+        url,
+        download_type="video",
+        quality="best",
+        audio_format="mp3",
+        max_workers=4,
+        concurrent_fragments=8,
+        use_aria2c=False,
+        progress_bar=None,
+        status_text=None,
     ):
+        """Download entire playlist, fetching several videos concurrently.
+
+        For audio, FFmpeg conversion runs in a separate pool so the next items
+        keep downloading while earlier ones are converted.
+        """
         ffmpeg_path = r"C:\ffmpeg\bin"
-        """Download entire playlist."""
+
+        try:
+            # Enumerate the playlist without resolving each video; share and
+            # embed links still resolve to the playlist itself
+            info = self._extract_info(url, extract_flat="in_playlist")
+        except Exception as e:
+            return False, str(e), 0, None
+
+        if info.get("entries") is None:
+            return False, "URL is not a playlist", 0, None
+
+        playlist_title = info.get("title", "playlist")
+        # Each entry runs in its own future, so a failed item raises there and
+        # is counted without stopping the rest of the playlist
+        entries = [e for e in info["entries"] if e]
+        playlist_folder = self.download_path / yt_dlp.utils.sanitize_filename(
+            playlist_title
+        )
+        # Entries are downloaded one URL at a time, so yt-dlp no longer knows
+        # the playlist index; bake it into each output template instead.
+        width = len(str(len(entries)))
+        folder_tmpl = str(playlist_folder).replace("%", "%%")
+
         if download_type == "video":
             ydl_opts = {
-                "format": (
-                    "bestvideo+bestaudio/best"
-                    if quality == "best"
-                    else f"bestvideo[height<={quality[:-1]}]+bestaudio/best"
-                ),
-                "outtmpl": str(
-                    self.download_path
-                    / "%(playlist)s/%(playlist_index)s - %(title)s.%(ext)s"
-                ),
+                **self._download_opts(concurrent_fragments, use_aria2c),
+                "format": _FORMAT_BY_QUALITY[quality],
                 "merge_output_format": "mp4",
-                "ignoreerrors": True,  # Continue on errors
             }
         else:
+            # Conversion happens in _convert_one, off the download workers
             ydl_opts = {
-                "format": "bestaudio/best",
-                "outtmpl": str(
-                    self.download_path
-                    / "%(playlist)s/%(playlist_index)s - %(title)s.%(ext)s"
+                **self._download_opts(concurrent_fragments, use_aria2c),
+                "format": _AUDIO_SOURCE_BY_FORMAT.get(audio_format, "bestaudio/best"),
+            }
+
+        def _dl_one(index, entry):
+            # yt-dlp instances are not thread-safe, so each worker gets its own
+            opts = dict(
+                ydl_opts,
+                outtmpl=os.path.join(
+                    folder_tmpl, f"{index:0{width}d} - %(title)s.%(ext)s"
                 ),
-                "ffmpeg_location": ffmpeg_path,
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": audio_format,
-                        "preferredquality": "192",
-                    }
-                ],
-                "ignoreerrors": True,
+            )
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                return ydl.extract_info(entry.get("url") or entry["id"])
+
+        def _convert_one(info):
+            pp_opts = {"quiet": True, "ffmpeg_location": ffmpeg_path}
+            with yt_dlp.YoutubeDL(pp_opts) as ydl:
+                pp = yt_dlp.postprocessor.FFmpegExtractAudioPP(
+                    ydl, preferredcodec=audio_format, preferredquality="192"
+                )
+                for download in info.get("requested_downloads") or []:
+                    ydl.run_pp(pp, download)
+            return info
+
+        completed = done = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as dl_ex, ThreadPoolExecutor(
+            max_workers=os.cpu_count()
+        ) as pp_ex:
+            pending = {
+                dl_ex.submit(_dl_one, index, entry): "download"
+                for index, entry in enumerate(entries, 1)
             }
+            # Streamlit widgets can only be updated from the script thread,
+            # so progress is reported here as items move through the stages.
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = pending.pop(future)
+                    try:
+                        info = future.result()
+                    except Exception:
+                        info = None
+                    if info and stage == "download" and download_type != "video":
+                        pending[pp_ex.submit(_convert_one, info)] = "convert"
+                        continue
+                    done += 1
+                    completed += bool(info)
+                    if progress_bar:
+                        progress_bar.progress(done / len(entries))
+                    if status_text:
+                        status_text.text(f"Downloaded {done} of {len(entries)} videos")
+
+        if not completed:
+            return False, "No videos could be downloaded", 0, None
+        return True, playlist_title, completed, str(playlist_folder)
+
+    def _meta_key(self, kind, url):
+        """Key metadata by YouTube ID so URL variants share an entry."""
+        pattern = _VIDEO_ID_RE if kind == "video" else _PLAYLIST_ID_RE
+        match = pattern.search(url)
+        return f"{kind}:{match.group(1) if match else url}"
+
+    def _load_meta(self, key):
+        """Return cached metadata from memory or disk, if still fresh."""
+        info = self._info_cache.get(key)
+        if info is not None:
+            return info
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT payload FROM meta WHERE id=? AND fetched_at > ?",
+                (key, int(time.time()) - META_TTL),
+            ).fetchone()
+        if row is None:
+            return None
+        info = json.loads(row[0])
+        self._info_cache[key] = info
+        return info
+
+    def _store_meta(self, key, info):
+        """Save metadata to memory and disk."""
+        self._info_cache[key] = info
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?, ?)",
+                (key, int(time.time()), json.dumps(info)),
+            )
+            self._db.commit()
 
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                playlist_title = info.get("title", "playlist")
-                video_count = len(info.get("entries", []))
-                playlist_folder = self.download_path / playlist_title
-                return True, playlist_title, video_count, str(playlist_folder)
-        except Exception as e:
-            return False, str(e), 0, None
+    def clear_cache(self):
+        """Forget all cached preview metadata."""
+        self._info_cache.clear()
+        self._raw_info_cache.clear()
+        with self._db_lock:
+            self._db.execute("DELETE FROM meta")
+            self._db.commit()
 
     def get_video_info(self, url):
         """Get video information without downloading."""
-        ydl_opts = {"quiet": True}
+        key = self._meta_key("video", url)
+        cached = self._load_meta(key)
+        if cached is not None:
+            return cached
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                duration_min = info.get("duration", 0) // 60
-                duration_sec = info.get("duration", 0) % 60
-
-                return {
-                    "title": info.get("title"),
-                    "duration": f"{duration_min}:{duration_sec:02d}",
-                    "uploader": info.get("uploader"),
-                    "views": info.get("view_count", 0),
-                    "thumbnail": info.get("thumbnail"),
-                    "description": (
-                        info.get("description", "")[:300] + "..."
-                        if len(info.get("description", "")) > 300
-                        else info.get("description", "")
-                    ),
-                }
+            info = self._extract_info(url)
+            # Keep the resolved formats so a following download can skip
+            # another extractor pass
+            self._raw_info_cache[key] = info
+            description = info.get("description") or ""
+            duration_min = info.get("duration", 0) // 60
+            duration_sec = info.get("duration", 0) % 60
+
+            video_info = {
+                "title": info.get("title"),
+                "duration": f"{duration_min}:{duration_sec:02d}",
+                "uploader": info.get("uploader"),
+                "views": info.get("view_count", 0),
+                "thumbnail": info.get("thumbnail"),
+                "description": description[:300]
+                + ("..." if len(description) > 300 else ""),
+            }
+            self._store_meta(key, video_info)
+            return video_info
         except Exception as e:
             return None
 
     def get_playlist_info(self, url):
         """Get playlist information without downloading."""
-        ydl_opts = {
-            "quiet": True,
-            "extract_flat": True,  # Don't download, just get info
-        }
+        key = self._meta_key("playlist", url)
+        cached = self._load_meta(key)
+        if cached is not None:
+            return cached
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-
-                if "entries" in info:
-                    return {
-                        "title": info.get("title"),
-                        "uploader": info.get("uploader"),
-                        "video_count": len(info["entries"]),
-                        "videos": [
-                            {
-                                "title": entry.get("title"),
-                                "duration": entry.get("duration"),
-                            }
-                            for entry in info["entries"][:10]
-                        ],  # First 10 videos
-                    }
-                return None
+            # Only list the first page of entries; the total comes from the
+            # playlist header rather than from walking every entry
+            info = self._extract_info(
+                url, extract_flat="in_playlist", lazy_playlist=True, playlistend=10
+            )
+
+            if "entries" in info:
+                playlist_info = {
+                    "title": info.get("title"),
+                    "uploader": info.get("uploader"),
+                    "video_count": info.get("playlist_count"),
+                    "videos": [
+                        {
+                            "title": entry.get("title"),
+                            "duration": entry.get("duration"),
+                        }
+                        for entry in info["entries"][:10]
+                    ],  # First 10 videos
+                }
+                self._store_meta(key, playlist_info)
+                return playlist_info
+            return None
         except Exception as e:
             return None
 
-    def create_zip(self, folder_path, zip_name):
-        """Create a zip file from a folder."""
+    def create_zip(self, folder_path, zip_name, compression=zipfile.ZIP_STORED):
+        """Create a zip file from a folder.
+
+        Media files are already compressed, so entries are stored as-is by
+        default instead of spending CPU on DEFLATE for no size reduction.
+        """
         zip_path = self.download_path / f"{zip_name}.zip"
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            folder = Path(folder_path)
-            for file in folder.rglob("*"):
-                if file.is_file():
-                    zipf.write(file, file.relative_to(folder.parent))
+        with zipfile.ZipFile(zip_path, "w", compression, allowZip64=True) as zipf:
+            parent = os.path.dirname(os.path.abspath(folder_path))
+            if compression == zipfile.ZIP_DEFLATED:
+                self._write_deflated(zipf, folder_path, parent)
+            else:
+                for entry in _walk_files(folder_path):
+                    zipf.write(entry.path, os.path.relpath(entry.path, parent))
         return str(zip_path)
 
+    def _write_deflated(self, zipf, folder_path, parent):
+        """Deflate files on all cores, then append them to zipf in order.
+
+        zlib releases the GIL while compressing, so threads scale across
+        cores without pickling work out to subprocesses. Only one file per
+        worker is in flight, so compressed copies waiting in tmp_dir stay
+        bounded instead of growing towards the size of the whole playlist.
+
+        Writing pre-compressed entries relies on the ZipFile internals fp,
+        filelist, NameToInfo and start_dir, mirroring what ZipFile.writestr
+        does with them.
+        """
+        entries = _walk_files(folder_path)
+        workers = os.cpu_count() or 1
+        with tempfile.TemporaryDirectory(dir=self.download_path) as tmp_dir:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+
+                def submit(entry):
+                    return entry, ex.submit(_deflate_file, entry.path, tmp_dir)
+
+                in_flight = deque(map(submit, itertools.islice(entries, workers)))
+                while in_flight:
+                    entry, future = in_flight.popleft()
+                    tmp_path, crc, size, compress_size = future.result()
+                    # Refill the window before copying this entry into place
+                    in_flight.extend(map(submit, itertools.islice(entries, 1)))
+                    zinfo = zipfile.ZipInfo.from_file(
+                        entry.path, os.path.relpath(entry.path, parent)
+                    )
+                    zinfo.compress_type = zipfile.ZIP_DEFLATED
+                    zinfo.CRC = crc
+                    zinfo.file_size = size
+                    zinfo.compress_size = compress_size
+                    zinfo.header_offset = zipf.fp.tell()
+                    zip64 = max(size, compress_size) > zipfile.ZIP64_LIMIT
+                    zipf.fp.write(zinfo.FileHeader(zip64))
+                    with open(tmp_path, "rb") as src:
+                        shutil.copyfileobj(src, zipf.fp, 1 << 20)
+                    os.remove(tmp_path)
+                    # Register the entry so close() writes the central directory
+                    zipf.filelist.append(zinfo)
+                    zipf.NameToInfo[zinfo.filename] = zinfo
+                    zipf.start_dir = zipf.fp.tell()
+
+
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+_http.mount("http://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+
+@st.cache_data(ttl=3600, max_entries=500, show_spinner=False)
+def fetch_thumbnail(url):
+    """Download a thumbnail over a pooled connection, cached across reruns."""
+    response = _http.get(url, timeout=SOCKET_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+@st.cache_resource
+def get_downloader():
+    """Share one downloader, and its metadata cache, across script reruns."""
+    return YouTubeDownloader()
+
 
 def main():
     st.set_page_config(page_title="YouTube Downloader", page_icon="🎬", layout="wide")
@@ -204,7 +609,7 @@ def main():
     st.markdown("---")
 
     # Initialize downloader
-    downloader = YouTubeDownloader()
+    downloader = get_downloader()
 
     # Sidebar for settings
     with st.sidebar:
@@ -235,6 +640,24 @@ def main():
                 help="Select audio format",
             )
 
+        if content_type == "Playlist":
+            compress_zip = st.checkbox(
+                "Compress ZIP",
+                help="Deflate the playlist archive; rarely shrinks media files",
+            )
+
+        concurrent_fragments = st.slider(
+            "Parallel fragments",
+            1,
+            16,
+            8,
+            help="Number of stream fragments to download at the same time",
+        )
+        use_aria2c = st.toggle(
+            "🚀 Use aria2c (if available)",
+            help="Download each file over multiple connections with aria2c",
+        )
+
         st.markdown("---")
         st.markdown("### 📝 Instructions")
         if content_type == "Single Video":
@@ -257,6 +680,11 @@ def main():
             """
             )
 
+        st.markdown("---")
+        if st.button("🧨 Clear metadata cache", use_container_width=True):
+            downloader.clear_cache()
+            st.toast("Metadata cache cleared")
+
         st.markdown("---")
         st.warning("⚠️ Only download content you have permission to download.")
 
@@ -295,7 +723,11 @@ def main():
 
                     with col1:
                         if info["thumbnail"]:
-                            st.image(info["thumbnail"], use_container_width=True)
+                            try:
+                                thumbnail = fetch_thumbnail(info["thumbnail"])
+                            except requests.RequestException:
+                                thumbnail = info["thumbnail"]
+                            st.image(thumbnail, use_container_width=True)
 
                     with col2:
                         st.subheader(info["title"])
@@ -317,7 +749,7 @@ def main():
 
                     st.subheader(info["title"])
                     st.write(f"**Uploader:** {info['uploader']}")
-                    st.write(f"**Total Videos:** {info['video_count']}")
+                    st.write(f"**Total Videos:** {info['video_count'] or 'Unknown'}")
 
                     with st.expander(f"📋 First {len(info['videos'])} Videos"):
                         for i, video in enumerate(info["videos"], 1):
@@ -361,10 +793,22 @@ def main():
                 status_text.text("Starting download...")
 
                 if download_type == "Video":
-                    success, result, filename = downloader.download_video(url, quality)
+                    success, result, filename = downloader.download_video(
+                        url,
+                        quality,
+                        concurrent_fragments,
+                        use_aria2c,
+                        progress_bar,
+                        status_text,
+                    )
                 else:
                     success, result, filename = downloader.download_audio(
-                        url, audio_format
+                        url,
+                        audio_format,
+                        concurrent_fragments,
+                        use_aria2c,
+                        progress_bar,
+                        status_text,
                     )
 
                 progress_bar.progress(100)
@@ -392,19 +836,28 @@ def main():
                 status_text = st.empty()
 
                 status_text.text("Starting playlist download... This may take a while.")
-                progress_bar.progress(10)
 
                 if download_type == "Video":
                     success, result, count, folder = downloader.download_playlist(
-                        url, "video", quality
+                        url,
+                        "video",
+                        quality,
+                        concurrent_fragments=concurrent_fragments,
+                        use_aria2c=use_aria2c,
+                        progress_bar=progress_bar,
+                        status_text=status_text,
                     )
                 else:
                     success, result, count, folder = downloader.download_playlist(
-                        url, "audio", audio_format=audio_format
+                        url,
+                        "audio",
+                        audio_format=audio_format,
+                        concurrent_fragments=concurrent_fragments,
+                        use_aria2c=use_aria2c,
+                        progress_bar=progress_bar,
+                        status_text=status_text,
                     )
 
-                progress_bar.progress(90)
-
                 if success:
                     progress_bar.progress(100)
                     status_text.empty()
@@ -414,7 +867,15 @@ def main():
                     # Create zip file
                     if folder and os.path.exists(folder):
                         with st.spinner("Creating zip file..."):
-                            zip_path = downloader.create_zip(folder, result)
+                            zip_path = downloader.create_zip(
+                                folder,
+                                os.path.basename(folder),
+                                (
+                                    zipfile.ZIP_DEFLATED
+                                    if compress_zip
+                                    else zipfile.ZIP_STORED
+                                ),
+                            )
 
                         if os.path.exists(zip_path):
                             with open(zip_path, "rb") as file: